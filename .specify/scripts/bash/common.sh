@@ -151,6 +151,20 @@ CONTRACTS_DIR='$feature_dir/contracts'
 EOF
 }
 
+# Local, untracked state for the specify scripts (hashes, indexes).
+# The directory ignores itself so it never shows up in git status.
+get_cache_dir() {
+    local repo_root="$1"
+    local cache_dir="$repo_root/.specify/.cache"
+
+    if [[ ! -d "$cache_dir" ]]; then
+        mkdir -p "$cache_dir" || return 1
+        echo '*' > "$cache_dir/.gitignore"
+    fi
+
+    echo "$cache_dir"
+}
+
 check_file() { [[ -f "$1" ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
 check_dir() { [[ -d "$1" && -n $(ls -A "$1" 2>/dev/null) ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
 
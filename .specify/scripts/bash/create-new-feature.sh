@@ -3,6 +3,8 @@
 set -e
 
 JSON_MODE=false
+FETCH_REMOTES=false
+REBUILD_INDEX=false
 SHORT_NAME=""
 BRANCH_NUMBER=""
 ARGS=()
@@ -40,18 +42,30 @@ while [ $i -le $# ]; do
             fi
             BRANCH_NUMBER="$next_arg"
             ;;
+        --fetch)
+            FETCH_REMOTES=true
+            ;;
+        --rebuild-index)
+            REBUILD_INDEX=true
+            ;;
         --help|-h) 
-            echo "Usage: $0 [--json] [--short-name <name>] [--number N] <feature_description>"
+            echo "Usage: $0 [--json] [--short-name <name>] [--number N] [--fetch] [--rebuild-index] <feature_description>"
             echo ""
             echo "Options:"
             echo "  --json              Output in JSON format"
             echo "  --short-name <name> Provide a custom short name (2-4 words) for the branch"
             echo "  --number N          Specify branch number manually (overrides auto-detection)"
+            echo "  --fetch             Fetch all remotes and reconcile the feature index before allocating"
+            echo "  --rebuild-index     Rebuild the local feature index from branches and specs/ (no network)"
             echo "  --help, -h          Show this help message"
             echo ""
+            echo "Feature numbers are allocated from a local index (.specify/.cache/feature-index),"
+            echo "so no network access is needed. The index is rebuilt automatically if missing."
+            echo ""
             echo "Examples:"
             echo "  $0 'Add user authentication system' --short-name 'user-auth'"
             echo "  $0 'Implement OAuth2 integration for API' --number 5"
+            echo "  $0 'Add audit log' --fetch"
             exit 0
             ;;
         *) 
@@ -63,7 +77,7 @@ done
 
 FEATURE_DESCRIPTION="${ARGS[*]}"
 if [ -z "$FEATURE_DESCRIPTION" ]; then
-    echo "Usage: $0 [--json] [--short-name <name>] [--number N] <feature_description>" >&2
+    echo "Usage: $0 [--json] [--short-name <name>] [--number N] [--fetch] [--rebuild-index] <feature_description>" >&2
     exit 1
 fi
 
@@ -80,73 +94,193 @@ find_repo_root() {
     return 1
 }
 
-# Function to get highest number from specs directory
+# Print "NNN short-name" for every feature found in local/remote-tracking
+# branches and in the specs directory. Remote refs are only as fresh as the
+# last fetch; nothing here touches the network.
+scan_feature_sources() {
+    local specs_dir="$1"
+
+    {
+        if [ "$HAS_GIT" = true ]; then
+            git for-each-ref --format='%(refname)' refs/heads refs/remotes 2>/dev/null | \
+                sed -e 's|^refs/heads/||' -e 's|^refs/remotes/[^/]*/||'
+        fi
+        if [ -d "$specs_dir" ]; then
+            for dir in "$specs_dir"/*; do
+                [ -d "$dir" ] && basename "$dir"
+            done
+        fi
+    } | awk '/^[0-9]+-/ { num = $0; sub(/-.*/, "", num); printf "%03d %s\n", num + 0, substr($0, length(num) + 2) }' | \
+        sort -u
+}
+
+# Rewrite the feature index atomically from branches and specs/.
+# Format: a "highest=NNN" header line followed by "NNN short-name" entries.
+rebuild_feature_index() {
+    local specs_dir="$1"
+    local temp_file
+
+    temp_file=$(mktemp "$FEATURE_INDEX.XXXXXX") || return 1
+    scan_feature_sources "$specs_dir" | \
+        awk '{ lines[NR] = $0; if ($1 + 0 > highest) highest = $1 + 0 }
+             END { printf "highest=%03d\n", highest; for (i = 1; i <= NR; i++) print lines[i] }' \
+        > "$temp_file"
+    mv "$temp_file" "$FEATURE_INDEX"
+}
+
+# Print the highest allocated number from the index header (O(1): one line read)
+get_highest_from_index() {
+    local header=""
+
+    [ -f "$FEATURE_INDEX" ] && IFS= read -r header < "$FEATURE_INDEX"
+    case "$header" in
+        highest=[0-9]*) echo $((10#${header#highest=})) ;;
+        *) return 1 ;;
+    esac
+}
+
+# Add an allocated feature to the index, rewriting it atomically
+record_feature_in_index() {
+    local feature_num="$1"
+    local short_name="$2"
+    local highest
+    local temp_file
+
+    highest=$(get_highest_from_index || echo 0)
+    if [ "$((10#$feature_num))" -gt "$highest" ]; then
+        highest=$((10#$feature_num))
+    fi
+
+    temp_file=$(mktemp "$FEATURE_INDEX.XXXXXX") || return 1
+    {
+        printf 'highest=%03d\n' "$highest"
+        {
+            [ -f "$FEATURE_INDEX" ] && tail -n +2 "$FEATURE_INDEX"
+            echo "$feature_num $short_name"
+        } | sort -u
+    } > "$temp_file"
+    mv "$temp_file" "$FEATURE_INDEX"
+}
+
+# A number is taken if a spec directory, local branch or remote-tracking
+# branch already uses it. Remote-tracking refs are local; no fetch happens.
+feature_number_taken() {
+    local feature_num="$1"
+
+    compgen -G "$SPECS_DIR/${feature_num}-*" >/dev/null && return 0
+    if [ "$HAS_GIT" = true ] && \
+        [ -n "$(git for-each-ref --count=1 --format='%(refname)' \
+            "refs/heads/${feature_num}-*" "refs/remotes/*/${feature_num}-*")" ]; then
+        return 0
+    fi
+    return 1
+}
+
+# Print the highest number among specs/ directories. The glob expands
+# sorted, so only the last zero-padded entry needs to be looked at.
 get_highest_from_specs() {
     local specs_dir="$1"
-    local highest=0
-    
-    if [ -d "$specs_dir" ]; then
-        for dir in "$specs_dir"/*; do
-            [ -d "$dir" ] || continue
-            dirname=$(basename "$dir")
-            number=$(echo "$dirname" | grep -o '^[0-9]\+' || echo "0")
-            number=$((10#$number))
-            if [ "$number" -gt "$highest" ]; then
-                highest=$number
-            fi
-        done
+    local dirs=("$specs_dir"/[0-9][0-9][0-9]-*)
+    local last="${dirs[${#dirs[@]}-1]}"
+
+    if [ -d "$last" ]; then
+        last=$(basename "$last")
+        echo $((10#${last%%-*}))
+    else
+        echo 0
     fi
-    
-    echo "$highest"
 }
 
-# Function to get highest number from git branches
-get_highest_from_branches() {
-    local highest=0
-    
-    # Get all branches (local and remote)
-    branches=$(git branch -a 2>/dev/null || echo "")
-    
-    if [ -n "$branches" ]; then
-        while IFS= read -r branch; do
-            # Clean branch name: remove leading markers and remote prefixes
-            clean_branch=$(echo "$branch" | sed 's/^[* ]*//; s|^remotes/[^/]*/||')
-            
-            # Extract feature number if branch matches pattern ###-*
-            if echo "$clean_branch" | grep -q '^[0-9]\{3\}-'; then
-                number=$(echo "$clean_branch" | grep -o '^[0-9]\{3\}' || echo "0")
-                number=$((10#$number))
-                if [ "$number" -gt "$highest" ]; then
-                    highest=$number
-                fi
+# Print the highest number among local and remote-tracking feature branches.
+# for-each-ref sorts on the last path component, so one ref is enough.
+get_highest_from_refs() {
+    local name=""
+
+    if [ "$HAS_GIT" = true ]; then
+        name=$(git for-each-ref --sort=-refname:lstrip=-1 --count=1 \
+            --format='%(refname:lstrip=-1)' \
+            'refs/heads/[0-9][0-9][0-9]-*' 'refs/remotes/*/[0-9][0-9][0-9]-*' 2>/dev/null)
+    fi
+    if [ -n "$name" ]; then
+        echo $((10#${name%%-*}))
+    else
+        echo 0
+    fi
+}
+
+# Serialize allocations so concurrent runs never hand out the same number.
+# The lock directory holds the owner's PID; a lock is broken as soon as that
+# process is found to be gone, and never while it is still running.
+acquire_index_lock() {
+    local lock_dir="$FEATURE_INDEX.lock"
+    local tries=0
+    local holder
+
+    until mkdir "$lock_dir" 2>/dev/null; do
+        holder=$(cat "$lock_dir/pid" 2>/dev/null || echo "")
+        # No PID yet means the owner is between mkdir and writing it; wait
+        if { [ -n "$holder" ] && ! kill -0 "$holder" 2>/dev/null; } || \
+            { [ -z "$holder" ] && [ "$tries" -ge 50 ]; }; then
+            # Re-read so a lock just re-taken by another run is left alone
+            if [ "$(cat "$lock_dir/pid" 2>/dev/null || echo "")" = "$holder" ]; then
+                >&2 echo "[specify] Warning: Removing stale feature index lock${holder:+ left by process $holder}"
+                rm -rf "$lock_dir"
             fi
-        done <<< "$branches"
+            tries=0
+            continue
+        fi
+        tries=$((tries + 1))
+        if [ "$tries" -ge 50 ]; then
+            echo "Error: Feature index is locked by running process $holder ($lock_dir)" >&2
+            exit 1
+        fi
+        sleep 0.1
+    done
+    echo $$ > "$lock_dir/pid"
+    trap 'release_index_lock' EXIT
+}
+
+# Remove the lock, but only if this process owns it
+release_index_lock() {
+    local lock_dir="$FEATURE_INDEX.lock"
+
+    if [ "$(cat "$lock_dir/pid" 2>/dev/null)" = "$$" ]; then
+        rm -rf "$lock_dir"
     fi
-    
-    echo "$highest"
+    trap - EXIT
 }
 
-# Function to check existing branches (local and remote) and return next available number
-check_existing_branches() {
+# Return the next available feature number from the local index
+allocate_feature_number() {
     local specs_dir="$1"
+    local highest
 
-    # Fetch all remotes to get latest branch info (suppress errors if no remotes)
-    git fetch --all --prune 2>/dev/null || true
-
-    # Get highest number from ALL branches (not just matching short name)
-    local highest_branch=$(get_highest_from_branches)
+    # --fetch already refreshed the remote refs before the lock was taken
+    if [ "$REBUILD_INDEX" = true ] || [ "$FETCH_REMOTES" = true ]; then
+        rebuild_feature_index "$specs_dir"
+    fi
 
-    # Get highest number from ALL specs (not just matching short name)
-    local highest_spec=$(get_highest_from_specs "$specs_dir")
+    if ! highest=$(get_highest_from_index); then
+        rebuild_feature_index "$specs_dir"
+        highest=$(get_highest_from_index || echo 0)
+    fi
 
-    # Take the maximum of both
-    local max_num=$highest_branch
-    if [ "$highest_spec" -gt "$max_num" ]; then
-        max_num=$highest_spec
+    # The index is stale if a pull brought in a higher spec, a fetch brought
+    # in a higher branch, or someone else took the next number; rebuild so
+    # allocation stays monotonic
+    if [ "$(get_highest_from_specs "$specs_dir")" -gt "$highest" ] || \
+        [ "$(get_highest_from_refs)" -gt "$highest" ] || \
+        feature_number_taken "$(printf "%03d" "$((highest + 1))")"; then
+        rebuild_feature_index "$specs_dir"
+        highest=$(get_highest_from_index || echo 0)
     fi
 
-    # Return next number
-    echo $((max_num + 1))
+    local next=$((highest + 1))
+    while feature_number_taken "$(printf "%03d" "$next")"; do
+        next=$((next + 1))
+    done
+
+    echo "$next"
 }
 
 # Function to clean and format a branch name
@@ -159,6 +293,7 @@ clean_branch_name() {
 # to searching for repository markers so the workflow still functions in repositories that
 # were initialised with --no-git.
 SCRIPT_DIR="$(CDPATH="" cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
 
 if git rev-parse --show-toplevel >/dev/null 2>&1; then
     REPO_ROOT=$(git rev-parse --show-toplevel)
@@ -177,6 +312,8 @@ cd "$REPO_ROOT"
 SPECS_DIR="$REPO_ROOT/specs"
 mkdir -p "$SPECS_DIR"
 
+FEATURE_INDEX="$(get_cache_dir "$REPO_ROOT")/feature-index"
+
 # Function to generate branch name with stop word filtering and length filtering
 generate_branch_name() {
     local description="$1"
@@ -234,16 +371,16 @@ else
     BRANCH_SUFFIX=$(generate_branch_name "$FEATURE_DESCRIPTION")
 fi
 
-# Determine branch number
+# Determine branch number (the lock is held until the index records it)
+if [ -z "$BRANCH_NUMBER" ] && [ "$FETCH_REMOTES" = true ] && [ "$HAS_GIT" = true ]; then
+    # Opt-in reconciliation with remotes, done before taking the lock so a slow
+    # network never blocks other runs (suppress errors if offline or no remotes)
+    git fetch --all --prune >/dev/null 2>&1 || >&2 echo "[specify] Warning: git fetch failed; using local refs only"
+fi
+
+acquire_index_lock
 if [ -z "$BRANCH_NUMBER" ]; then
-    if [ "$HAS_GIT" = true ]; then
-        # Check existing branches on remotes
-        BRANCH_NUMBER=$(check_existing_branches "$SPECS_DIR")
-    else
-        # Fall back to local directory check
-        HIGHEST=$(get_highest_from_specs "$SPECS_DIR")
-        BRANCH_NUMBER=$((HIGHEST + 1))
-    fi
+    BRANCH_NUMBER=$(allocate_feature_number "$SPECS_DIR")
 fi
 
 # Force base-10 interpretation to prevent octal conversion (e.g., 010 → 8 in octal, but should be 10 in decimal)
@@ -280,6 +417,9 @@ fi
 FEATURE_DIR="$SPECS_DIR/$BRANCH_NAME"
 mkdir -p "$FEATURE_DIR"
 
+record_feature_in_index "$FEATURE_NUM" "${BRANCH_NAME#"$FEATURE_NUM"-}"
+release_index_lock
+
 TEMPLATE="$REPO_ROOT/.specify/templates/spec-template.md"
 SPEC_FILE="$FEATURE_DIR/spec.md"
 if [ -f "$TEMPLATE" ]; then cp "$TEMPLATE" "$SPEC_FILE"; else touch "$SPEC_FILE"; fi
@@ -12,13 +12,16 @@
 #    - Validates file permissions and accessibility
 #
 # 2. Plan Data Extraction
-#    - Parses plan.md files to extract project metadata
+#    - Parses plan.md in a single pass into a structured plan record
 #    - Identifies language/version, frameworks, databases, and project types
 #    - Handles missing or incomplete specification data gracefully
+#    - Stores a hash of the record so unchanged plans are a no-op on re-run
 #
 # 3. Agent File Management
 #    - Creates new agent context files from templates when needed
 #    - Updates existing agent files with new project information
+#    - Skips agent files whose sections would not change
+#    - Writes each file atomically (temp file in the same directory + mv)
 #    - Preserves manual additions and custom configurations
 #    - Supports multiple AI agent formats and directory structures
 #
@@ -32,6 +35,7 @@
 #    - Handles agent-specific file paths and naming conventions
 #    - Supports: Claude, Gemini, Copilot, Cursor, Qwen, opencode, Codex, Windsurf, Kilo Code, Auggie CLI, Roo Code, CodeBuddy CLI, Qoder CLI, Amp, SHAI, Amazon Q Developer CLI, or Antigravity
 #    - Can update single agents or all existing agent files
+#    - Agents sharing a context file (e.g. AGENTS.md) are updated once
 #    - Creates default Claude file if no agent files exist
 #
 # Usage: ./update-agent-context.sh [agent_type]
@@ -85,6 +89,23 @@ NEW_LANG=""
 NEW_FRAMEWORK=""
 NEW_DB=""
 NEW_PROJECT_TYPE=""
+NEW_TECH_STACK=""
+
+# Structured plan record and its hash (see parse_plan_data)
+PLAN_RECORD=""
+STATE_FILE=""
+
+# Resolved update targets (parallel arrays, one entry per unique file)
+TARGET_FILES=()
+TARGET_NAMES=()
+
+# Set by update_agent_file: whether the last target was actually written
+LAST_FILE_CHANGED=false
+CHANGED_COUNT=0
+UNCHANGED_COUNT=0
+
+# Temp file currently being written, removed by cleanup on failure
+CURRENT_TEMP_FILE=""
 
 #==============================================================================
 # Utility Functions
@@ -109,11 +130,29 @@ log_warning() {
 # Cleanup function for temporary files
 cleanup() {
     local exit_code=$?
-    rm -f /tmp/agent_update_*_$$
-    rm -f /tmp/manual_additions_$$
+    if [[ -n "$CURRENT_TEMP_FILE" ]]; then
+        rm -f "$CURRENT_TEMP_FILE" "$CURRENT_TEMP_FILE.bak" "$CURRENT_TEMP_FILE.bak2"
+    fi
     exit $exit_code
 }
 
+# Create a temp file next to the target so the final mv is an atomic rename
+make_temp_for() {
+    local target_file="$1"
+    mktemp "$(dirname "$target_file")/.$(basename "$target_file").XXXXXX"
+}
+
+# Print a content hash of stdin, using whichever tool is available
+hash_stdin() {
+    if command -v sha256sum >/dev/null 2>&1; then
+        sha256sum | cut -d' ' -f1
+    elif command -v shasum >/dev/null 2>&1; then
+        shasum -a 256 | cut -d' ' -f1
+    else
+        cksum | cut -d' ' -f1
+    fi
+}
+
 # Set up cleanup trap
 trap cleanup EXIT INT TERM
 
@@ -154,16 +193,21 @@ validate_environment() {
 # Plan Parsing Functions
 #==============================================================================
 
-extract_plan_field() {
-    local field_pattern="$1"
-    local plan_file="$2"
-    
-    grep "^\*\*${field_pattern}\*\*: " "$plan_file" 2>/dev/null | \
-        head -1 | \
-        sed "s|^\*\*${field_pattern}\*\*: ||" | \
-        sed 's/^[ \t]*//;s/[ \t]*$//' | \
-        grep -v "NEEDS CLARIFICATION" | \
-        grep -v "^N/A$" || echo ""
+# Normalize a raw plan field value into the named variable: trim whitespace
+# and drop placeholder values ("NEEDS CLARIFICATION", "N/A").
+clean_plan_value() {
+    local var_name="$1"
+    local value="$2"
+
+    value="${value%$'\r'}"
+    value="${value#"${value%%[![:space:]]*}"}"
+    value="${value%"${value##*[![:space:]]}"}"
+
+    if [[ "$value" == *"NEEDS CLARIFICATION"* ]] || [[ "$value" == "N/A" ]]; then
+        value=""
+    fi
+
+    printf -v "$var_name" '%s' "$value"
 }
 
 parse_plan_data() {
@@ -181,10 +225,48 @@ parse_plan_data() {
     
     log_info "Parsing plan data from $plan_file"
     
-    NEW_LANG=$(extract_plan_field "Language/Version" "$plan_file")
-    NEW_FRAMEWORK=$(extract_plan_field "Primary Dependencies" "$plan_file")
-    NEW_DB=$(extract_plan_field "Storage" "$plan_file")
-    NEW_PROJECT_TYPE=$(extract_plan_field "Project Type" "$plan_file")
+    # Single pass over plan.md; only the first occurrence of each field counts
+    local line
+    local seen_lang="" seen_framework="" seen_db="" seen_type=""
+    
+    while IFS= read -r line || [[ -n "$line" ]]; do
+        case "$line" in
+            "**Language/Version**: "*)
+                [[ -n "$seen_lang" ]] && continue
+                seen_lang=1
+                clean_plan_value NEW_LANG "${line#"**Language/Version**: "}"
+                ;;
+            "**Primary Dependencies**: "*)
+                [[ -n "$seen_framework" ]] && continue
+                seen_framework=1
+                clean_plan_value NEW_FRAMEWORK "${line#"**Primary Dependencies**: "}"
+                ;;
+            "**Storage**: "*)
+                [[ -n "$seen_db" ]] && continue
+                seen_db=1
+                clean_plan_value NEW_DB "${line#"**Storage**: "}"
+                ;;
+            "**Project Type**: "*)
+                [[ -n "$seen_type" ]] && continue
+                seen_type=1
+                clean_plan_value NEW_PROJECT_TYPE "${line#"**Project Type**: "}"
+                ;;
+        esac
+        
+        if [[ -n "$seen_lang" && -n "$seen_framework" && -n "$seen_db" && -n "$seen_type" ]]; then
+            break
+        fi
+    done < "$plan_file"
+    
+    NEW_TECH_STACK=$(format_technology_stack "$NEW_LANG" "$NEW_FRAMEWORK")
+    
+    # Everything the generated sections depend on, one field per line
+    PLAN_RECORD=$(printf '%s\n' \
+        "branch=$CURRENT_BRANCH" \
+        "lang=$NEW_LANG" \
+        "framework=$NEW_FRAMEWORK" \
+        "db=$NEW_DB" \
+        "project_type=$NEW_PROJECT_TYPE")
     
     # Log what we found
     if [[ -n "$NEW_LANG" ]]; then
@@ -197,7 +279,7 @@ parse_plan_data() {
         log_info "Found framework: $NEW_FRAMEWORK"
     fi
     
-    if [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]]; then
+    if [[ -n "$NEW_DB" ]]; then
         log_info "Found database: $NEW_DB"
     fi
     
@@ -365,140 +447,171 @@ update_existing_agent_file() {
     local target_file="$1"
     local current_date="$2"
     
-    log_info "Updating existing agent context file..."
+    LAST_FILE_CHANGED=false
     
-    # Use a single temporary file for atomic update
-    local temp_file
-    temp_file=$(mktemp) || {
-        log_error "Failed to create temporary file"
-        return 1
-    }
+    # Read the file once; every check below works on this snapshot
+    local lines=()
+    mapfile -t lines < "$target_file"
+    local content
+    content=$(IFS=$'\n'; printf '%s' "${lines[*]}")
     
-    # Process the file in one pass
-    local tech_stack=$(format_technology_stack "$NEW_LANG" "$NEW_FRAMEWORK")
+    local tech_stack="$NEW_TECH_STACK"
     local new_tech_entries=()
     local new_change_entry=""
     
     # Prepare new technology entries
-    if [[ -n "$tech_stack" ]] && ! grep -q "$tech_stack" "$target_file"; then
+    if [[ -n "$tech_stack" ]] && [[ "$content" != *"$tech_stack"* ]]; then
         new_tech_entries+=("- $tech_stack ($CURRENT_BRANCH)")
     fi
     
-    if [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]] && ! grep -q "$NEW_DB" "$target_file"; then
+    if [[ -n "$NEW_DB" ]] && [[ "$content" != *"$NEW_DB"* ]]; then
         new_tech_entries+=("- $NEW_DB ($CURRENT_BRANCH)")
     fi
     
     # Prepare new change entry
     if [[ -n "$tech_stack" ]]; then
         new_change_entry="- $CURRENT_BRANCH: Added $tech_stack"
-    elif [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]]; then
+    elif [[ -n "$NEW_DB" ]]; then
         new_change_entry="- $CURRENT_BRANCH: Added $NEW_DB"
     fi
     
-    # Check if sections exist in the file
+    # Check which sections exist and what the newest recorded change is
     local has_active_technologies=0
     local has_recent_changes=0
+    local first_change_entry=""
+    local in_changes_section=false
+    local line
     
-    if grep -q "^## Active Technologies" "$target_file" 2>/dev/null; then
-        has_active_technologies=1
+    for line in "${lines[@]}"; do
+        if [[ "$line" == "## Active Technologies" ]]; then
+            has_active_technologies=1
+        elif [[ "$line" == "## Recent Changes" ]]; then
+            has_recent_changes=1
+            in_changes_section=true
+        elif [[ $in_changes_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
+            in_changes_section=false
+        elif [[ $in_changes_section == true ]] && [[ "$line" == "- "* ]] && [[ -z "$first_change_entry" ]]; then
+            first_change_entry="$line"
+        fi
+    done
+    
+    # This feature is already the most recent change; don't stack duplicates
+    if [[ -n "$new_change_entry" ]] && [[ "$new_change_entry" == "$first_change_entry" ]]; then
+        new_change_entry=""
     fi
     
-    if grep -q "^## Recent Changes" "$target_file" 2>/dev/null; then
-        has_recent_changes=1
+    if [[ ${#new_tech_entries[@]} -eq 0 ]] && [[ -z "$new_change_entry" ]]; then
+        log_info "Agent context file already up to date, leaving it untouched"
+        return 0
     fi
     
+    log_info "Updating existing agent context file..."
+    
+    # Use a single temporary file in the target directory for atomic update
+    local temp_file
+    temp_file=$(make_temp_for "$target_file") || {
+        log_error "Failed to create temporary file"
+        return 1
+    }
+    CURRENT_TEMP_FILE="$temp_file"
+    
     # Process file line by line
     local in_tech_section=false
-    local in_changes_section=false
     local tech_entries_added=false
-    local changes_entries_added=false
     local existing_changes_count=0
-    local file_ended=false
-    
-    while IFS= read -r line || [[ -n "$line" ]]; do
-        # Handle Active Technologies section
-        if [[ "$line" == "## Active Technologies" ]]; then
-            echo "$line" >> "$temp_file"
-            in_tech_section=true
-            continue
-        elif [[ $in_tech_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
-            # Add new tech entries before closing the section
-            if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-                printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-                tech_entries_added=true
+    # Recent Changes holds 3 entries; reserve one slot only when prepending ours
+    local max_existing_changes=3
+    [[ -n "$new_change_entry" ]] && max_existing_changes=2
+    in_changes_section=false
+    
+    {
+        for line in "${lines[@]}"; do
+            # Handle Active Technologies section
+            if [[ "$line" == "## Active Technologies" ]]; then
+                echo "$line"
+                in_tech_section=true
+                continue
+            elif [[ $in_tech_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
+                # Add new tech entries before closing the section
+                if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
+                    printf '%s\n' "${new_tech_entries[@]}"
+                    tech_entries_added=true
+                fi
+                echo "$line"
+                in_tech_section=false
+                continue
+            elif [[ $in_tech_section == true ]] && [[ -z "$line" ]]; then
+                # Add new tech entries before empty line in tech section
+                if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
+                    printf '%s\n' "${new_tech_entries[@]}"
+                    tech_entries_added=true
+                fi
+                echo "$line"
+                continue
             fi
-            echo "$line" >> "$temp_file"
-            in_tech_section=false
-            continue
-        elif [[ $in_tech_section == true ]] && [[ -z "$line" ]]; then
-            # Add new tech entries before empty line in tech section
-            if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-                printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-                tech_entries_added=true
+            
+            # Handle Recent Changes section
+            if [[ "$line" == "## Recent Changes" ]]; then
+                echo "$line"
+                # Add new change entry right after the heading
+                if [[ -n "$new_change_entry" ]]; then
+                    echo "$new_change_entry"
+                fi
+                in_changes_section=true
+                continue
+            elif [[ $in_changes_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
+                echo "$line"
+                in_changes_section=false
+                continue
+            elif [[ $in_changes_section == true ]] && [[ "$line" == "- "* ]]; then
+                # Keep only the newest existing changes, dropping older copies of ours
+                if [[ "$line" != "$new_change_entry" ]] && [[ $existing_changes_count -lt $max_existing_changes ]]; then
+                    echo "$line"
+                    existing_changes_count=$((existing_changes_count + 1))
+                fi
+                continue
             fi
-            echo "$line" >> "$temp_file"
-            continue
+            
+            # Update timestamp
+            if [[ "$line" =~ \*\*Last\ updated\*\*:.*[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] ]]; then
+                echo "$line" | sed "s/[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]/$current_date/"
+            else
+                echo "$line"
+            fi
+        done
+        
+        # Post-loop check: if we're still in the Active Technologies section and haven't added new entries
+        if [[ $in_tech_section == true ]] && [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
+            printf '%s\n' "${new_tech_entries[@]}"
         fi
         
-        # Handle Recent Changes section
-        if [[ "$line" == "## Recent Changes" ]]; then
-            echo "$line" >> "$temp_file"
-            # Add new change entry right after the heading
-            if [[ -n "$new_change_entry" ]]; then
-                echo "$new_change_entry" >> "$temp_file"
-            fi
-            in_changes_section=true
-            changes_entries_added=true
-            continue
-        elif [[ $in_changes_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
-            echo "$line" >> "$temp_file"
-            in_changes_section=false
-            continue
-        elif [[ $in_changes_section == true ]] && [[ "$line" == "- "* ]]; then
-            # Keep only first 2 existing changes
-            if [[ $existing_changes_count -lt 2 ]]; then
-                echo "$line" >> "$temp_file"
-                ((existing_changes_count++))
-            fi
-            continue
+        # If sections don't exist, add them at the end of the file
+        if [[ $has_active_technologies -eq 0 ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
+            echo ""
+            echo "## Active Technologies"
+            printf '%s\n' "${new_tech_entries[@]}"
         fi
         
-        # Update timestamp
-        if [[ "$line" =~ \*\*Last\ updated\*\*:.*[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] ]]; then
-            echo "$line" | sed "s/[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]/$current_date/" >> "$temp_file"
-        else
-            echo "$line" >> "$temp_file"
+        if [[ $has_recent_changes -eq 0 ]] && [[ -n "$new_change_entry" ]]; then
+            echo ""
+            echo "## Recent Changes"
+            echo "$new_change_entry"
         fi
-    done < "$target_file"
-    
-    # Post-loop check: if we're still in the Active Technologies section and haven't added new entries
-    if [[ $in_tech_section == true ]] && [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-        printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-        tech_entries_added=true
-    fi
+    } > "$temp_file"
     
-    # If sections don't exist, add them at the end of the file
-    if [[ $has_active_technologies -eq 0 ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-        echo "" >> "$temp_file"
-        echo "## Active Technologies" >> "$temp_file"
-        printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-        tech_entries_added=true
-    fi
-    
-    if [[ $has_recent_changes -eq 0 ]] && [[ -n "$new_change_entry" ]]; then
-        echo "" >> "$temp_file"
-        echo "## Recent Changes" >> "$temp_file"
-        echo "$new_change_entry" >> "$temp_file"
-        changes_entries_added=true
-    fi
+    # Preserve the original file mode across the rename
+    chmod "$(stat -c '%a' "$target_file" 2>/dev/null || stat -f '%Lp' "$target_file")" "$temp_file" 2>/dev/null || true
     
     # Move temp file to target atomically
     if ! mv "$temp_file" "$target_file"; then
         log_error "Failed to update target file"
         rm -f "$temp_file"
+        CURRENT_TEMP_FILE=""
         return 1
     fi
+    CURRENT_TEMP_FILE=""
     
+    LAST_FILE_CHANGED=true
     return 0
 }
 #==============================================================================
@@ -534,13 +647,16 @@ update_agent_file() {
     if [[ ! -f "$target_file" ]]; then
         # Create new file from template
         local temp_file
-        temp_file=$(mktemp) || {
+        temp_file=$(make_temp_for "$target_file") || {
             log_error "Failed to create temporary file"
             return 1
         }
+        CURRENT_TEMP_FILE="$temp_file"
         
         if create_new_agent_file "$target_file" "$temp_file" "$project_name" "$current_date"; then
             if mv "$temp_file" "$target_file"; then
+                CURRENT_TEMP_FILE=""
+                CHANGED_COUNT=$((CHANGED_COUNT + 1))
                 log_success "Created new $agent_name context file"
             else
                 log_error "Failed to move temporary file to $target_file"
@@ -565,7 +681,13 @@ update_agent_file() {
         fi
         
         if update_existing_agent_file "$target_file" "$current_date"; then
-            log_success "Updated existing $agent_name context file"
+            if [[ "$LAST_FILE_CHANGED" == true ]]; then
+                CHANGED_COUNT=$((CHANGED_COUNT + 1))
+                log_success "Updated existing $agent_name context file"
+            else
+                UNCHANGED_COUNT=$((UNCHANGED_COUNT + 1))
+                log_success "$agent_name context file unchanged"
+            fi
         else
             log_error "Failed to update existing agent file"
             return 1
@@ -579,63 +701,78 @@ update_agent_file() {
 # Agent Selection and Processing
 #==============================================================================
 
-update_specific_agent() {
+# Register an update target, skipping files already registered (several
+# agents share AGENTS.md, which must only be rewritten once per run)
+add_target() {
+    local target_file="$1"
+    local agent_name="$2"
+    local existing
+    
+    for existing in "${TARGET_FILES[@]+"${TARGET_FILES[@]}"}"; do
+        [[ "$existing" == "$target_file" ]] && return 0
+    done
+    
+    TARGET_FILES+=("$target_file")
+    TARGET_NAMES+=("$agent_name")
+}
+
+resolve_specific_agent() {
     local agent_type="$1"
     
     case "$agent_type" in
         claude)
-            update_agent_file "$CLAUDE_FILE" "Claude Code"
+            add_target "$CLAUDE_FILE" "Claude Code"
             ;;
         gemini)
-            update_agent_file "$GEMINI_FILE" "Gemini CLI"
+            add_target "$GEMINI_FILE" "Gemini CLI"
             ;;
         copilot)
-            update_agent_file "$COPILOT_FILE" "GitHub Copilot"
+            add_target "$COPILOT_FILE" "GitHub Copilot"
             ;;
         cursor-agent)
-            update_agent_file "$CURSOR_FILE" "Cursor IDE"
+            add_target "$CURSOR_FILE" "Cursor IDE"
             ;;
         qwen)
-            update_agent_file "$QWEN_FILE" "Qwen Code"
+            add_target "$QWEN_FILE" "Qwen Code"
             ;;
         opencode)
-            update_agent_file "$AGENTS_FILE" "opencode"
+            add_target "$AGENTS_FILE" "opencode"
             ;;
         codex)
-            update_agent_file "$AGENTS_FILE" "Codex CLI"
+            add_target "$AGENTS_FILE" "Codex CLI"
             ;;
         windsurf)
-            update_agent_file "$WINDSURF_FILE" "Windsurf"
+            add_target "$WINDSURF_FILE" "Windsurf"
             ;;
         kilocode)
-            update_agent_file "$KILOCODE_FILE" "Kilo Code"
+            add_target "$KILOCODE_FILE" "Kilo Code"
             ;;
         auggie)
-            update_agent_file "$AUGGIE_FILE" "Auggie CLI"
+            add_target "$AUGGIE_FILE" "Auggie CLI"
             ;;
         roo)
-            update_agent_file "$ROO_FILE" "Roo Code"
+            add_target "$ROO_FILE" "Roo Code"
             ;;
         codebuddy)
-            update_agent_file "$CODEBUDDY_FILE" "CodeBuddy CLI"
+            add_target "$CODEBUDDY_FILE" "CodeBuddy CLI"
             ;;
         qoder)
-            update_agent_file "$QODER_FILE" "Qoder CLI"
+            add_target "$QODER_FILE" "Qoder CLI"
             ;;
         amp)
-            update_agent_file "$AMP_FILE" "Amp"
+            add_target "$AMP_FILE" "Amp"
             ;;
         shai)
-            update_agent_file "$SHAI_FILE" "SHAI"
+            add_target "$SHAI_FILE" "SHAI"
             ;;
         q)
-            update_agent_file "$Q_FILE" "Amazon Q Developer CLI"
+            add_target "$Q_FILE" "Amazon Q Developer CLI"
             ;;
         agy)
-            update_agent_file "$AGY_FILE" "Antigravity"
+            add_target "$AGY_FILE" "Antigravity"
             ;;
         bob)
-            update_agent_file "$BOB_FILE" "IBM Bob"
+            add_target "$BOB_FILE" "IBM Bob"
             ;;
         *)
             log_error "Unknown agent type '$agent_type'"
@@ -645,96 +782,87 @@ update_specific_agent() {
     esac
 }
 
-update_all_existing_agents() {
-    local found_agent=false
+resolve_all_existing_agents() {
+    # Check each possible agent file and register it if it exists
+    [[ -f "$CLAUDE_FILE" ]] && add_target "$CLAUDE_FILE" "Claude Code"
+    [[ -f "$GEMINI_FILE" ]] && add_target "$GEMINI_FILE" "Gemini CLI"
+    [[ -f "$COPILOT_FILE" ]] && add_target "$COPILOT_FILE" "GitHub Copilot"
+    [[ -f "$CURSOR_FILE" ]] && add_target "$CURSOR_FILE" "Cursor IDE"
+    [[ -f "$QWEN_FILE" ]] && add_target "$QWEN_FILE" "Qwen Code"
+    [[ -f "$AGENTS_FILE" ]] && add_target "$AGENTS_FILE" "Codex/opencode"
+    [[ -f "$WINDSURF_FILE" ]] && add_target "$WINDSURF_FILE" "Windsurf"
+    [[ -f "$KILOCODE_FILE" ]] && add_target "$KILOCODE_FILE" "Kilo Code"
+    [[ -f "$AUGGIE_FILE" ]] && add_target "$AUGGIE_FILE" "Auggie CLI"
+    [[ -f "$ROO_FILE" ]] && add_target "$ROO_FILE" "Roo Code"
+    [[ -f "$CODEBUDDY_FILE" ]] && add_target "$CODEBUDDY_FILE" "CodeBuddy CLI"
+    [[ -f "$SHAI_FILE" ]] && add_target "$SHAI_FILE" "SHAI"
+    [[ -f "$QODER_FILE" ]] && add_target "$QODER_FILE" "Qoder CLI"
+    [[ -f "$Q_FILE" ]] && add_target "$Q_FILE" "Amazon Q Developer CLI"
+    [[ -f "$AGY_FILE" ]] && add_target "$AGY_FILE" "Antigravity"
+    [[ -f "$BOB_FILE" ]] && add_target "$BOB_FILE" "IBM Bob"
     
-    # Check each possible agent file and update if it exists
-    if [[ -f "$CLAUDE_FILE" ]]; then
-        update_agent_file "$CLAUDE_FILE" "Claude Code"
-        found_agent=true
-    fi
-    
-    if [[ -f "$GEMINI_FILE" ]]; then
-        update_agent_file "$GEMINI_FILE" "Gemini CLI"
-        found_agent=true
-    fi
-    
-    if [[ -f "$COPILOT_FILE" ]]; then
-        update_agent_file "$COPILOT_FILE" "GitHub Copilot"
-        found_agent=true
-    fi
-    
-    if [[ -f "$CURSOR_FILE" ]]; then
-        update_agent_file "$CURSOR_FILE" "Cursor IDE"
-        found_agent=true
-    fi
-    
-    if [[ -f "$QWEN_FILE" ]]; then
-        update_agent_file "$QWEN_FILE" "Qwen Code"
-        found_agent=true
-    fi
-    
-    if [[ -f "$AGENTS_FILE" ]]; then
-        update_agent_file "$AGENTS_FILE" "Codex/opencode"
-        found_agent=true
-    fi
-    
-    if [[ -f "$WINDSURF_FILE" ]]; then
-        update_agent_file "$WINDSURF_FILE" "Windsurf"
-        found_agent=true
+    # If no agent files exist, create a default Claude file
+    if [[ ${#TARGET_FILES[@]} -eq 0 ]]; then
+        log_info "No existing agent files found, creating default Claude file..."
+        add_target "$CLAUDE_FILE" "Claude Code"
     fi
     
-    if [[ -f "$KILOCODE_FILE" ]]; then
-        update_agent_file "$KILOCODE_FILE" "Kilo Code"
-        found_agent=true
-    fi
+    return 0
+}
 
-    if [[ -f "$AUGGIE_FILE" ]]; then
-        update_agent_file "$AUGGIE_FILE" "Auggie CLI"
-        found_agent=true
-    fi
+update_targets() {
+    local success=true
+    local i
     
-    if [[ -f "$ROO_FILE" ]]; then
-        update_agent_file "$ROO_FILE" "Roo Code"
-        found_agent=true
-    fi
-
-    if [[ -f "$CODEBUDDY_FILE" ]]; then
-        update_agent_file "$CODEBUDDY_FILE" "CodeBuddy CLI"
-        found_agent=true
-    fi
+    for i in "${!TARGET_FILES[@]}"; do
+        if ! update_agent_file "${TARGET_FILES[$i]}" "${TARGET_NAMES[$i]}"; then
+            success=false
+        fi
+    done
+    
+    [[ "$success" == true ]]
+}
 
-    if [[ -f "$SHAI_FILE" ]]; then
-        update_agent_file "$SHAI_FILE" "SHAI"
-        found_agent=true
-    fi
+#==============================================================================
+# Plan State Cache
+#==============================================================================
 
-    if [[ -f "$QODER_FILE" ]]; then
-        update_agent_file "$QODER_FILE" "Qoder CLI"
-        found_agent=true
-    fi
+# Hash of everything a run depends on: the plan record plus the target files
+compute_state_hash() {
+    {
+        printf '%s\n' "$PLAN_RECORD"
+        printf '%s\n' "${TARGET_FILES[@]}"
+    } | hash_stdin
+}
 
-    if [[ -f "$Q_FILE" ]]; then
-        update_agent_file "$Q_FILE" "Amazon Q Developer CLI"
-        found_agent=true
-    fi
+# True when the stored hash matches and no target was created or edited since
+plan_state_is_current() {
+    local state_hash="$1"
+    local target_file
+    
+    [[ -n "$STATE_FILE" && -f "$STATE_FILE" ]] || return 1
+    [[ "$(<"$STATE_FILE")" == "$state_hash" ]] || return 1
+    
+    for target_file in "${TARGET_FILES[@]}"; do
+        [[ -f "$target_file" ]] || return 1
+        [[ "$target_file" -nt "$STATE_FILE" ]] && return 1
+    done
+    
+    return 0
+}
 
-    if [[ -f "$AGY_FILE" ]]; then
-        update_agent_file "$AGY_FILE" "Antigravity"
-        found_agent=true
-    fi
+save_plan_state() {
+    local state_hash="$1"
+    local temp_file
     
-    if [[ -f "$BOB_FILE" ]]; then
-        update_agent_file "$BOB_FILE" "IBM Bob"
-        found_agent=true
-    fi
+    [[ -n "$STATE_FILE" ]] || return 0
     
-    # If no agent files exist, create a default Claude file
-    if [[ "$found_agent" == false ]]; then
-        log_info "No existing agent files found, creating default Claude file..."
-        update_agent_file "$CLAUDE_FILE" "Claude Code"
-    fi
+    temp_file=$(make_temp_for "$STATE_FILE") || return 0
+    CURRENT_TEMP_FILE="$temp_file"
+    echo "$state_hash" > "$temp_file" && mv "$temp_file" "$STATE_FILE" || rm -f "$temp_file"
+    CURRENT_TEMP_FILE=""
 }
+
 print_summary() {
     echo
     log_info "Summary of changes:"
@@ -747,10 +875,11 @@ print_summary() {
         echo "  - Added framework: $NEW_FRAMEWORK"
     fi
     
-    if [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]]; then
+    if [[ -n "$NEW_DB" ]]; then
         echo "  - Added database: $NEW_DB"
     fi
     
+    echo "  - Files written: $CHANGED_COUNT, unchanged: $UNCHANGED_COUNT"
     echo
 
     log_info "Usage: $0 [claude|gemini|copilot|cursor-agent|qwen|opencode|codex|windsurf|kilocode|auggie|codebuddy|shai|q|agy|bob|qoder]"
@@ -772,21 +901,37 @@ main() {
         exit 1
     fi
     
-    # Process based on agent type argument
-    local success=true
-    
+    # Resolve which files to touch based on agent type argument
     if [[ -z "$AGENT_TYPE" ]]; then
         # No specific agent provided - update all existing agent files
         log_info "No agent specified, updating all existing agent files..."
-        if ! update_all_existing_agents; then
-            success=false
-        fi
+        resolve_all_existing_agents
     else
         # Specific agent provided - update only that agent
         log_info "Updating specific agent: $AGENT_TYPE"
-        if ! update_specific_agent "$AGENT_TYPE"; then
-            success=false
-        fi
+        resolve_specific_agent "$AGENT_TYPE"
+    fi
+    
+    # Skip everything when neither the plan record nor the targets changed
+    local state_dir
+    if state_dir=$(get_cache_dir "$REPO_ROOT"); then
+        mkdir -p "$state_dir/agent-context" && STATE_FILE="$state_dir/agent-context/${CURRENT_BRANCH//\//-}.sha256"
+    fi
+    
+    local state_hash
+    state_hash=$(compute_state_hash)
+    
+    if plan_state_is_current "$state_hash"; then
+        log_success "Plan unchanged since last update, nothing to do"
+        exit 0
+    fi
+    
+    local success=true
+    
+    if update_targets; then
+        save_plan_state "$state_hash"
+    else
+        success=false
     fi
     
     # Print summary
@@ -4,11 +4,17 @@ Injects SDD plugin context as system reminder when sdd commands detected.
 Also writes a marker file for the PreToolUse skill gate hook to enforce
 that the Skill tool is called before any other tool.
 """
+import time
+
+_SCRIPT_STARTED = time.perf_counter()
+
 import json
 import os
 import sys
 from pathlib import Path
 
+from hook_telemetry import HookTimer
+
 
 def get_marker_path(session_id):
     """Return the skill gate marker file path for a given session."""
@@ -23,16 +29,21 @@ def clear_marker(session_id):
 
 
 def read_hook_input():
-    """Read and parse hook input JSON from stdin."""
+    """Read and parse hook input JSON from stdin.
+
+    Returns the parsed input and the raw payload size in bytes.
+    """
     try:
-        return json.loads(sys.stdin.read())
+        raw = sys.stdin.read()
+        return json.loads(raw), len(raw.encode())
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(2)
 
 
-def main():
-    hook_input = read_hook_input()
+def main(timer):
+    hook_input, payload_bytes = read_hook_input()
+    timer.parsed(hook_input, payload_bytes)
 
     prompt = hook_input.get('prompt', '')
     session_id = hook_input.get('session_id', 'unknown')
@@ -40,6 +51,7 @@ def main():
 
     # For non-SDD commands, clean up any stale marker and exit
     if not prompt.startswith('/sdd:'):
+        timer.decide('pass')
         clear_marker(session_id)
         sys.exit(0)
 
@@ -96,6 +108,7 @@ def main():
                 )
             }
         }
+        timer.decide('unknown-command', skill=skill_name)
         print(json.dumps(response))
         sys.exit(0)
 
@@ -117,9 +130,11 @@ def main():
         delegates_to_skill = True
 
     if delegates_to_skill:
+        timer.decide('inject-gate', skill=skill_name)
         marker = get_marker_path(session_id)
         marker.write_text(skill_name)
     else:
+        timer.decide('inject', skill=skill_name)
         clear_marker(session_id)
 
     # Parse init arguments (--refresh, --update)
@@ -167,4 +182,8 @@ A PreToolUse hook will BLOCK any other tool call until the Skill tool is invoked
 
 
 if __name__ == "__main__":
-    main()
+    timer = HookTimer('UserPromptSubmit', _SCRIPT_STARTED)
+    try:
+        main(timer)
+    finally:
+        timer.write()
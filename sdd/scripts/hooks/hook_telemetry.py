@@ -0,0 +1,170 @@
+"""Opt-in latency and decision telemetry for the SDD hooks.
+
+When SDD_HOOK_TELEMETRY=1, context-hook.py and skill-gate-hook.py each append
+one compact JSON line per invocation to a local rolling log. The log is
+size-capped: once it exceeds SDD_HOOK_TELEMETRY_MAX_BYTES (default 1 MiB) it
+is rotated to <log>.1 (under <log>.lock), so at most two log files exist.
+
+Each record holds the hook event, session id, elapsed milliseconds split into
+interp (process start to the first line of the script, i.e. interpreter
+boot), startup (script start to main), parse (reading stdin) and decision
+(the rest), the decision taken, the pending skill, the skill actually invoked
+on release, and the payload size in bytes.
+
+interp is read from /proc/self/stat, whose start time has clock-tick
+resolution (usually 10 ms). It is omitted where /proc is unavailable, and the
+totals then leave out interpreter startup.
+
+Reporting lives in telemetry-report.py so the hooks never load it.
+"""
+
+# The hooks import this module on every call, so keep it to modules they
+# already load.
+import json
+import os
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+
+def is_enabled():
+    """Return True when hook telemetry is switched on via the environment."""
+    return os.environ.get('SDD_HOOK_TELEMETRY', '') not in ('', '0', 'false')
+
+
+def get_log_path():
+    """Return the telemetry log path (override with SDD_HOOK_TELEMETRY_FILE)."""
+    override = os.environ.get('SDD_HOOK_TELEMETRY_FILE')
+    if override:
+        return Path(override)
+    tmpdir = Path(os.environ.get('TMPDIR', '/tmp'))
+    return tmpdir / 'claude-sdd-hook-telemetry.jsonl'
+
+
+def get_interp_ms(script_started):
+    """Return milliseconds from process start to script_started, or None.
+
+    Linux only: the process start time in /proc/self/stat (field 22, clock
+    ticks since boot) is compared with CLOCK_BOOTTIME.
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            stat = f.read()
+        # Skip past "pid (comm)"; comm may itself contain spaces or parens
+        fields = stat[stat.rindex(')') + 2:].split()
+        started_since_boot = int(fields[19]) / os.sysconf('SC_CLK_TCK')
+        now_since_boot = time.clock_gettime(time.CLOCK_BOOTTIME)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    script_since_boot = now_since_boot - (time.perf_counter() - script_started)
+    return round(max(0.0, script_since_boot - started_since_boot) * 1000, 3)
+
+
+def get_max_bytes():
+    """Return the size cap for the active log file."""
+    try:
+        return int(os.environ.get('SDD_HOOK_TELEMETRY_MAX_BYTES', DEFAULT_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+class HookTimer:
+    """Collects phase timings for one hook invocation and writes its record.
+
+    All methods are no-ops when telemetry is disabled, and write errors are
+    swallowed: telemetry must never change what a hook does.
+    """
+
+    def __init__(self, event, script_started):
+        self.enabled = is_enabled()
+        self.event = event
+        self.script_started = script_started
+        self.main_started = time.perf_counter()
+        self.parsed_at = None
+        self.session_id = None
+        self.payload_bytes = 0
+        self.decision = 'error'
+        self.skill = None
+        self.tool = None
+        self.invoked = None
+
+    def parsed(self, hook_input, payload_bytes):
+        """Mark the end of the parse phase."""
+        self.parsed_at = time.perf_counter()
+        self.session_id = hook_input.get('session_id', 'unknown')
+        self.payload_bytes = payload_bytes
+
+    def decide(self, decision, skill=None, tool=None, invoked=None):
+        """Record the decision the hook is about to act on."""
+        self.decision = decision
+        self.skill = skill
+        self.tool = tool
+        self.invoked = invoked
+
+    def write(self):
+        """Append the record to the rolling log."""
+        if not self.enabled:
+            return
+        finished = time.perf_counter()
+        parsed_at = self.parsed_at or finished
+        record = {
+            'ts': round(time.time(), 3),
+            'event': self.event,
+            'session': self.session_id,
+            'startup_ms': round((self.main_started - self.script_started) * 1000, 3),
+            'parse_ms': round((parsed_at - self.main_started) * 1000, 3),
+            'decision_ms': round((finished - parsed_at) * 1000, 3),
+            'decision': self.decision,
+            'skill': self.skill,
+            'bytes': self.payload_bytes,
+        }
+        interp_ms = get_interp_ms(self.script_started)
+        if interp_ms is not None:
+            record['interp_ms'] = interp_ms
+        if self.tool is not None:
+            record['tool'] = self.tool
+        if self.invoked is not None:
+            record['invoked'] = self.invoked
+        try:
+            append_record(get_log_path(), record, get_max_bytes())
+        except OSError:
+            pass
+
+
+def rotate_log(log_path, max_bytes):
+    """Move the log to <log>.1 under an exclusive lock.
+
+    The size is re-checked once the lock is held, so when several hooks see
+    the log over the cap only the first rotates it; the others find the
+    fresh, small file and leave the previous generation in <log>.1 alone.
+    """
+    import fcntl
+
+    lock_path = log_path.with_name(log_path.name + '.lock')
+    fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if log_path.stat().st_size >= max_bytes:
+                os.replace(log_path, log_path.with_name(log_path.name + '.1'))
+        except FileNotFoundError:
+            pass
+    finally:
+        os.close(fd)
+
+
+def append_record(log_path, record, max_bytes):
+    """Append one JSON line, rotating the log to <log>.1 when over the cap."""
+    try:
+        if log_path.stat().st_size >= max_bytes:
+            rotate_log(log_path, max_bytes)
+    except FileNotFoundError:
+        pass
+    line = json.dumps(record, separators=(',', ':')) + '\n'
+    # A single small O_APPEND write keeps concurrent hooks from interleaving
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
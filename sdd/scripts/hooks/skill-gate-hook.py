@@ -8,11 +8,17 @@ and blocks any non-Skill tool call until the Skill tool is invoked first.
 This prevents the model from drifting into file exploration or analysis before
 invoking the skill that contains the process to follow.
 """
+import time
+
+_SCRIPT_STARTED = time.perf_counter()
+
 import json
 import os
 import sys
 from pathlib import Path
 
+from hook_telemetry import HookTimer
+
 
 def get_marker_path(session_id):
     """Return the marker file path for a given session."""
@@ -21,16 +27,21 @@ def get_marker_path(session_id):
 
 
 def read_hook_input():
-    """Read and parse hook input JSON from stdin."""
+    """Read and parse hook input JSON from stdin.
+
+    Returns the parsed input and the raw payload size in bytes.
+    """
     try:
-        return json.loads(sys.stdin.read())
+        raw = sys.stdin.read()
+        return json.loads(raw), len(raw.encode())
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(0)  # Non-blocking error: let tool proceed
 
 
-def main():
-    hook_input = read_hook_input()
+def main(timer):
+    hook_input, payload_bytes = read_hook_input()
+    timer.parsed(hook_input, payload_bytes)
 
     session_id = hook_input.get('session_id', 'unknown')
     tool_name = hook_input.get('tool_name', '')
@@ -38,15 +49,30 @@ def main():
     marker = get_marker_path(session_id)
 
     if not marker.exists():
+        timer.decide('allow', tool=tool_name)
         sys.exit(0)  # No pending skill, allow everything
 
     if tool_name == 'Skill':
         # Skill tool invoked, clear the gate
+        if timer.enabled:
+            # Log against the pending skill so deny rates share one key
+            tool_input = hook_input.get('tool_input')
+            invoked = tool_input.get('skill') if isinstance(tool_input, dict) else None
+            try:
+                pending_skill = marker.read_text().strip()
+            except FileNotFoundError:
+                pending_skill = None
+            timer.decide('release', skill=pending_skill, tool=tool_name, invoked=invoked)
         marker.unlink(missing_ok=True)
         sys.exit(0)
 
     # A non-Skill tool is being called while a skill invocation is pending
-    pending_skill = marker.read_text().strip()
+    try:
+        pending_skill = marker.read_text().strip()
+    except FileNotFoundError:
+        timer.decide('allow', tool=tool_name)
+        sys.exit(0)  # Gate was cleared concurrently
+    timer.decide('deny', skill=pending_skill, tool=tool_name)
 
     response = {
         "hookSpecificOutput": {
@@ -65,4 +91,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    timer = HookTimer('PreToolUse', _SCRIPT_STARTED)
+    try:
+        main(timer)
+    finally:
+        timer.write()
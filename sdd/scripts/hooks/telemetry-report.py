@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Report on SDD hook telemetry recorded by hook_telemetry.py.
+
+Prints latency percentiles per hook event and phase, the skill gate deny rate
+per pending skill, and the sessions that spent the most time in hooks.
+Records are only written while SDD_HOOK_TELEMETRY=1 is set.
+
+Totals include interpreter startup (the interp phase) only where the hooks
+could read the process start time from /proc; it has clock-tick (usually
+10 ms) resolution.
+
+Usage:
+  telemetry-report.py                 # Latency percentiles, deny rates, slowest sessions
+  telemetry-report.py --top 20        # Show more slow sessions
+  telemetry-report.py --file <log>    # Report on a specific log file
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from hook_telemetry import get_log_path
+
+
+def load_records(log_path):
+    """Read records from the rotated and active log files, oldest first."""
+    records = []
+    for path in (log_path.with_name(log_path.name + '.1'), log_path):
+        if not path.is_file():
+            continue
+        for line in path.read_text().splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def total_ms(record):
+    """Return the end-to-end latency of a record, from process start if known."""
+    return (record.get('interp_ms', 0) + record.get('startup_ms', 0)
+            + record.get('parse_ms', 0) + record.get('decision_ms', 0))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def print_latency(records):
+    by_event = defaultdict(list)
+    for r in records:
+        by_event[r.get('event', '?')].append(r)
+
+    print("Latency (ms):")
+    print(f"  {'event':<18} {'phase':<9} {'count':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for event in sorted(by_event):
+        rows = by_event[event]
+        phases = (
+            ('total', total_ms),
+            ('interp', lambda r: r.get('interp_ms')),
+            ('startup', lambda r: r.get('startup_ms', 0)),
+            ('parse', lambda r: r.get('parse_ms', 0)),
+            ('decision', lambda r: r.get('decision_ms', 0)),
+        )
+        for phase, getter in phases:
+            values = sorted(v for v in map(getter, rows) if v is not None)
+            if not values:
+                continue
+            print(f"  {event:<18} {phase:<9} {len(values):>6} "
+                  f"{percentile(values, 50):>8.2f} {percentile(values, 90):>8.2f} "
+                  f"{percentile(values, 99):>8.2f} {values[-1]:>8.2f}")
+
+
+def print_deny_rates(records):
+    gated = defaultdict(lambda: [0, 0])  # skill -> [denied, total]
+    for r in records:
+        if r.get('event') == 'PreToolUse' and r.get('skill'):
+            counts = gated[r['skill']]
+            counts[1] += 1
+            if r.get('decision') == 'deny':
+                counts[0] += 1
+
+    print()
+    print("Skill gate deny rate (PreToolUse calls while a skill was pending):")
+    if not gated:
+        print("  (no gated tool calls recorded)")
+        return
+    for skill, (denied, total) in sorted(gated.items(), key=lambda kv: -kv[1][0]):
+        print(f"  {skill:<28} {denied:>5}/{total:<5} {denied / total:>7.1%}")
+
+
+def print_slowest_sessions(records, top):
+    sessions = defaultdict(list)
+    for r in records:
+        sessions[r.get('session') or 'unknown'].append(total_ms(r))
+
+    print()
+    print(f"Slowest sessions (top {top} by total hook time):")
+    ranked = sorted(sessions.items(), key=lambda kv: -sum(kv[1]))[:top]
+    for session, values in ranked:
+        print(f"  {session:<40} {len(values):>5} calls "
+              f"{sum(values):>10.2f} ms total {max(values):>8.2f} ms max")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report on SDD hook latency and skill gate decisions'
+    )
+    parser.add_argument('--file', type=Path, default=None,
+                        help='Telemetry log (default: SDD_HOOK_TELEMETRY_FILE or $TMPDIR)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of slowest sessions to show')
+
+    args = parser.parse_args()
+    log_path = args.file or get_log_path()
+
+    records = load_records(log_path)
+    if not records:
+        print(f"No telemetry records found at {log_path}", file=sys.stderr)
+        print("Enable recording with SDD_HOOK_TELEMETRY=1", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Hook telemetry: {len(records)} records from {log_path}")
+    missing = sum(1 for r in records if 'interp_ms' not in r)
+    if missing:
+        print(f"Note: {missing} records lack interp_ms (no /proc); their totals "
+              f"exclude interpreter startup")
+    print()
+    print_latency(records)
+    print_deny_rates(records)
+    print_slowest_sessions(records, args.top)
+
+
+if __name__ == '__main__':
+    main()
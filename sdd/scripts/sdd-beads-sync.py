@@ -5,10 +5,13 @@ Usage:
   sdd-beads-sync.py <tasks-file>            # Forward sync (tasks -> bd)
   sdd-beads-sync.py <tasks-file> --reverse  # Reverse sync (bd -> tasks.md)
   sdd-beads-sync.py <tasks-file> --status   # Show sync status
+  sdd-beads-sync.py <tasks-file> --status --json  # Status as JSON (for dashboards)
   sdd-beads-sync.py <tasks-file> --dry-run  # Preview without creating
 
 Forward sync: Parses tasks.md, creates bd issues with dependencies and hierarchy.
 Reverse sync: Updates tasks.md checkboxes from bd issue status.
+Status: Per-phase and per-user-story rollups from one tasks.md parse and one
+issue snapshot (the JSONL in no-db mode, otherwise a single bd list call).
 """
 
 import argparse
@@ -17,6 +20,7 @@ import re
 import shutil
 import subprocess
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 
@@ -428,42 +432,332 @@ def do_reverse_sync(tasks_file, dry_run):
 
 # --- Status ---
 
-def do_status(tasks_file):
+CLOSED_STATUSES = ('closed',)
+ACTIVE_STATUSES = ('open', 'in_progress')
+
+
+RE_NO_DB = re.compile(r'^no-db:\s*true\s*$', re.MULTILINE)
+
+
+def find_beads_dir():
+    """Locate the .beads directory the way bd does, walking up from the cwd."""
+    for directory in (Path.cwd(), *Path.cwd().parents):
+        candidate = directory / '.beads'
+        if candidate.is_dir():
+            return candidate
+    return None
+
+
+def authoritative_jsonl(beads_dir):
+    """Return the JSONL path if it is the issue store itself, else None.
+
+    With a database backend (sqlite, dolt) the JSONL named by
+    ``jsonl_export`` in metadata.json is only an export that lags behind
+    ``bd close``/``bd update``. It is authoritative only in no-db mode.
+    """
+    try:
+        metadata = json.loads((beads_dir / 'metadata.json').read_text())
+    except (OSError, json.JSONDecodeError):
+        metadata = {}
+    try:
+        config = (beads_dir / 'config.yaml').read_text()
+    except OSError:
+        config = ''
+
+    backend = metadata.get('backend') or metadata.get('database')
+    no_db = backend == 'jsonl' or bool(RE_NO_DB.search(config))
+    jsonl = beads_dir / metadata.get('jsonl_export', 'issues.jsonl')
+    if no_db and jsonl.is_file():
+        return jsonl
+    return None
+
+
+def parse_jsonl(text):
+    """Parse beads JSONL (one issue per line), skipping malformed lines."""
+    issues = []
+    for line in text.splitlines():
+        try:
+            issues.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return issues
+
+
+def bd_list_json(*args):
+    """Run ``bd list --json`` with extra args; None if it gives no list."""
+    try:
+        data = json.loads(run_bd('list', '--json', *args, check=False) or 'null')
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, list) else None
+
+
+def has_dependency_edges(issues):
+    """Tell whether a bd list snapshot carries its dependency edges."""
+    if any('dependencies' in i for i in issues):
+        return True
+    # Some bd versions only report counts; all-zero counts still mean "no edges"
+    return bool(issues) and all(i.get('dependency_count') == 0 for i in issues)
+
+
+def load_issue_snapshot():
+    """Return (issues, source, deps_available, partial) from one issue read.
+
+    Sources, first that works wins:
+
+    1. The JSONL itself when it is authoritative (no-db mode); no bd process.
+    2. ``bd export`` to stdout: the same JSONL shape, with dependency edges
+       and closed issues, read live from the database.
+    3. ``bd list --json --all --limit 0``: every issue, but edges only on bd
+       versions that include them.
+    4. Plain ``bd list --json`` for bd versions without ``--all``/``--limit``:
+       open issues up to bd's default limit, so the report is marked partial.
+
+    deps_available is False (and ready/blocked are not computed) only when
+    the winning source has no dependency edges.
+    """
+    beads_dir = find_beads_dir()
+    jsonl = authoritative_jsonl(beads_dir) if beads_dir else None
+    if jsonl:
+        return parse_jsonl(jsonl.read_text()), str(jsonl), True, False
+
     check_bd()
-    ensure_db_fresh()
+    issues = parse_jsonl(run_bd('export', check=False))
+    if issues:
+        return issues, 'bd export', True, False
+
+    issues = bd_list_json('--all', '--limit', '0')
+    if issues is not None:
+        return issues, 'bd list', has_dependency_edges(issues), False
+
+    issues = bd_list_json()
+    if issues is not None:
+        return (issues, 'bd list (open only, limited)',
+                has_dependency_edges(issues), True)
+
+    print("ERROR: could not read issues from bd (export and list both failed)",
+          file=sys.stderr)
+    sys.exit(1)
 
-    lines = tasks_file.read_text().splitlines()
-    total = 0
-    checked = 0
-    synced = 0
-    unsynced = 0
+
+def parse_tasks(lines):
+    """Parse tasks.md once into (phases, tasks).
+
+    phases is a list of (phase_num, title); tasks is a list of dicts with
+    id, phase, story, done and marker (the bd id from a (bd-XXXX) marker).
+    """
+    phases = []
+    tasks = []
+    current_phase_num = None
+    in_deps_section = False
 
     for line in lines:
-        m = RE_TASK.match(line)
+        if RE_DEPS_HEADER.search(line):
+            in_deps_section = True
+            current_phase_num = None
+            continue
+
+        m = RE_PHASE.match(line)
         if m:
-            total += 1
-            if m.group(1) in ('X', 'x'):
-                checked += 1
-            if m.group(3):
-                synced += 1
-            else:
-                unsynced += 1
+            in_deps_section = False
+            current_phase_num = m.group(1)
+            phases.append((current_phase_num, m.group(2).strip()))
+            continue
+
+        if in_deps_section:
+            continue
+
+        m = RE_TASK.match(line)
+        if not m:
+            continue
+
+        marker = None
+        if m.group(3):
+            marker_m = RE_BD_MARKER.search(m.group(3))
+            if marker_m:
+                marker = f"bd-{marker_m.group(1)}"
+        us_m = RE_USER_STORY.search(m.group(4))
+
+        tasks.append({
+            'id': m.group(2),
+            'phase': current_phase_num,
+            'story': us_m.group(1) if us_m else None,
+            'done': m.group(1) in ('X', 'x'),
+            'marker': marker,
+        })
+
+    return phases, tasks
+
+
+def blocked_checker(issues):
+    """Return a memoized predicate telling whether an issue id is blocked.
+
+    An issue is blocked when one of its ``blocks`` dependencies is not
+    closed, or when its parent epic is blocked (inter-phase dependencies
+    are recorded on the phase epics).
+    """
+    status_by_id = {i['id']: i.get('status') for i in issues if 'id' in i}
+    blockers = defaultdict(list)
+    parent = {}
+    for issue in issues:
+        for dep in issue.get('dependencies') or []:
+            if dep.get('type') == 'blocks':
+                blockers[issue['id']].append(dep.get('depends_on_id'))
+            elif dep.get('type') == 'parent-child':
+                parent[issue['id']] = dep.get('depends_on_id')
+
+    memo = {}
+
+    def is_blocked(issue_id, seen=()):
+        if issue_id in memo:
+            return memo[issue_id]
+        if issue_id in seen:
+            return False
+        result = any(
+            status_by_id.get(b, 'closed') not in CLOSED_STATUSES
+            for b in blockers.get(issue_id, ())
+        )
+        if not result and issue_id in parent:
+            result = is_blocked(parent[issue_id], seen + (issue_id,))
+        memo[issue_id] = result
+        return result
+
+    return is_blocked
+
+
+def new_rollup(deps_available):
+    ready = 0 if deps_available else None
+    return {
+        'total': 0, 'completed': 0, 'synced': 0, 'unsynced': 0,
+        'drift': 0, 'ready': ready, 'blocked': ready,
+    }
+
+
+def compute_status(tasks_file, lines, issues, source, deps_available, partial=False):
+    """Build the status report from one parse and one issue snapshot.
+
+    Tasks are resolved to issues only through their own (bd-XXXX) marker:
+    spec ids such as T001 repeat in every feature's tasks.md.
+    """
+    phases, tasks = parse_tasks(lines)
+
+    by_id = {i['id']: i for i in issues if 'id' in i}
+    is_blocked = blocked_checker(issues)
+
+    totals = new_rollup(deps_available)
+    per_phase = {num: new_rollup(deps_available) for num, _ in phases}
+    per_story = defaultdict(lambda: new_rollup(deps_available))
+    drift = []
 
+    for task in tasks:
+        issue = by_id.get(task['marker']) if task['marker'] else None
+
+        rollups = [totals]
+        if task['phase'] in per_phase:
+            rollups.append(per_phase[task['phase']])
+        if task['story']:
+            rollups.append(per_story[task['story']])
+
+        status = issue.get('status') if issue else None
+        drifted = issue is not None and (
+            (task['done'] and status not in CLOSED_STATUSES)
+            or (not task['done'] and status in CLOSED_STATUSES)
+        )
+        if drifted:
+            drift.append({
+                'task': task['id'],
+                'issue': issue['id'],
+                'checkbox': 'done' if task['done'] else 'open',
+                'status': status,
+            })
+
+        for rollup in rollups:
+            rollup['total'] += 1
+            rollup['completed'] += task['done']
+            rollup['synced' if task['marker'] else 'unsynced'] += 1
+            rollup['drift'] += drifted
+            if deps_available and status in ACTIVE_STATUSES:
+                rollup['blocked' if is_blocked(issue['id']) else 'ready'] += 1
+
+    return {
+        'tasks_file': str(tasks_file),
+        'issue_source': source,
+        'deps_available': deps_available,
+        'partial': partial,
+        'totals': totals,
+        'phases': [
+            {'phase': num, 'title': title, **per_phase[num]}
+            for num, title in phases
+        ],
+        'user_stories': [
+            {'story': story, **per_story[story]}
+            for story in sorted(per_story, key=lambda s: int(s[2:]))
+        ],
+        'drift': drift,
+        'beads': {
+            'total': len(issues),
+            'open': sum(1 for i in issues if i.get('status') == 'open'),
+            'closed': sum(1 for i in issues if i.get('status') == 'closed'),
+        },
+    }
+
+
+def format_count(value):
+    return '-' if value is None else str(value)
+
+
+def print_rollup_table(label, rows, key):
+    print()
+    print(f"{label}:")
+    print(f"  {'':<8} {'done':>9} {'ready':>6} {'blocked':>8} {'drift':>6} {'unsynced':>9}")
+    for row in rows:
+        progress = f"{row['completed']}/{row['total']}"
+        print(f"  {row[key]:<8} {progress:>9} {format_count(row['ready']):>6} "
+              f"{format_count(row['blocked']):>8} {row['drift']:>6} {row['unsynced']:>9}")
+
+
+def do_status(tasks_file, as_json=False):
+    lines = tasks_file.read_text().splitlines()
+    issues, source, deps_available, partial = load_issue_snapshot()
+    report = compute_status(tasks_file, lines, issues, source, deps_available, partial)
+
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+
+    totals = report['totals']
     print(f"Beads sync status for: {tasks_file}")
-    print(f"  Total tasks: {total}")
-    print(f"  Completed:   {checked}")
-    print(f"  Synced (bd): {synced}")
-    print(f"  Unsynced:    {unsynced}")
+    print(f"  Issues from: {source}")
+    if partial:
+        print("  (partial snapshot: closed issues and issues past bd's list limit are missing)")
+    if not deps_available:
+        print("  (dependency edges unavailable; ready/blocked not computed)")
+    print(f"  Total tasks: {totals['total']}")
+    print(f"  Completed:   {totals['completed']}")
+    print(f"  Synced (bd): {totals['synced']}")
+    print(f"  Unsynced:    {totals['unsynced']}")
+    print(f"  Ready:       {format_count(totals['ready'])}")
+    print(f"  Blocked:     {format_count(totals['blocked'])}")
+
+    phase_rows = [{**p, 'label': f"Phase {p['phase']}"} for p in report['phases']]
+    if phase_rows:
+        print_rollup_table("By phase", phase_rows, 'label')
+    if report['user_stories']:
+        print_rollup_table("By user story", report['user_stories'], 'story')
+
+    if report['drift']:
+        print()
+        print("Drift (tasks.md checkbox vs beads status):")
+        for d in report['drift']:
+            print(f"  {d['task']} ({d['issue']}): checkbox {d['checkbox']}, bd {d['status']}")
 
     # BD database stats
-    all_issues = bd_list_json()
-    bd_open = sum(1 for i in all_issues if i.get('status') == 'open')
-    bd_closed = sum(1 for i in all_issues if i.get('status') == 'closed')
+    beads = report['beads']
     print()
     print("Beads database:")
-    print(f"  Total issues: {len(all_issues)}")
-    print(f"  Open:         {bd_open}")
-    print(f"  Closed:       {bd_closed}")
+    print(f"  Total issues: {beads['total']}")
+    print(f"  Open:         {beads['open']}")
+    print(f"  Closed:       {beads['closed']}")
 
 
 # --- Main ---
@@ -479,15 +773,19 @@ def main():
                         help='Show sync status')
     parser.add_argument('--dry-run', action='store_true',
                         help='Preview without creating')
+    parser.add_argument('--json', action='store_true',
+                        help='With --status, print the report as JSON')
 
     args = parser.parse_args()
+    if args.json and not args.status:
+        parser.error('--json requires --status')
 
     if not args.tasks_file.is_file():
         print(f"ERROR: tasks file not found: {args.tasks_file}", file=sys.stderr)
         sys.exit(1)
 
     if args.status:
-        do_status(args.tasks_file)
+        do_status(args.tasks_file, args.json)
     elif args.reverse:
         do_reverse_sync(args.tasks_file, args.dry_run)
     else: